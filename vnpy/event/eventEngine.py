@@ -159,6 +159,12 @@ class EventEngine(object):
         if not handlerList:
             del self.__handlers[type_]
             
+    #----------------------------------------------------------------------
+    def hasListeners(self, type_):
+        """检查是否有函数监听该事件（含通用处理函数）"""
+        # 使用get查询，避免defaultdict自动创建空列表
+        return bool(self.__generalHandlers or self.__handlers.get(type_))
+            
     #----------------------------------------------------------------------
     def put(self, event):
         """向事件队列中存入事件"""
@@ -301,6 +307,12 @@ class EventEngine2(object):
         if not handlerList:
             del self.__handlers[type_]  
         
+    #----------------------------------------------------------------------
+    def hasListeners(self, type_):
+        """检查是否有函数监听该事件（含通用处理函数）"""
+        # 使用get查询，避免defaultdict自动创建空列表
+        return bool(self.__generalHandlers or self.__handlers.get(type_))
+            
     #----------------------------------------------------------------------
     def put(self, event):
         """向事件队列中存入事件"""
@@ -14,6 +14,9 @@ import traceback
 ALGO_DICT = {}
 WIDGET_DICT = {}
 
+# 算法创建函数字典（templateName:algoClass.new），载入时预先绑定，创建算法时直接调用
+ALGO_FACTORY_DICT = {}
+
 
 #----------------------------------------------------------------------
 def loadAlgoModule(path, prefix):
@@ -43,6 +46,7 @@ def loadAlgoModule(path, prefix):
                     # 保存到字典中
                     if algo and widget:
                         ALGO_DICT[algo.templateName] = algo
+                        ALGO_FACTORY_DICT[algo.templateName] = algo.new
                         WIDGET_DICT[algo.templateName] = widget
                 except:
                     print ('-' * 20)
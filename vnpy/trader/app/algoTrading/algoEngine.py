@@ -6,9 +6,13 @@
 
 from __future__ import division
 import os
-import importlib
+import ast
+import atexit
 import json
 import traceback
+from threading import Thread, Lock, local
+from time import sleep
+from concurrent.futures import ThreadPoolExecutor
 
 from vnpy.event import Event
 from vnpy.rpc import RpcServer
@@ -20,8 +24,17 @@ from vnpy.trader.vtConstant import (DIRECTION_LONG, DIRECTION_SHORT,
 from vnpy.trader.vtObject import VtSubscribeReq, VtOrderReq, VtCancelOrderReq, VtLogData
 from vnpy.trader.vtFunction import getJsonPath
 from vnpy.trader.setup_logger import setup_logger
-from .algo import ALGO_DICT
-
+from .algo import ALGO_FACTORY_DICT
+
+# 配置文件的序列化优先使用C实现的orjson，未安装时使用标准库json（两者输出格式相同）
+try:
+    import orjson
+    _dumps = lambda data: orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _dumps = lambda data: json.dumps(data, indent=2, ensure_ascii=False).encode('UTF-8')
+    _loads = json.loads
 
 EVENT_ALGO_LOG = 'eAlgoLog'         # 算法日志事件
 EVENT_ALGO_PARAM = 'eAlgoParam'     # 算法参数事件
@@ -33,10 +46,28 @@ ALGOTRADING_DB_NAME = 'VnTrader_AlgoTrading_Db'     # AlgoTrading数据库名
 SETTING_COLLECTION_NAME = 'AlgoSetting'             # 算法配置集合名
 HISTORY_COLLECTION_NAME = 'AlgoHistory'             # 算法历史集合名
 
+HISTORY_FLUSH_INTERVAL = 0.1                        # 算法历史写入数据库的间隔（秒）
+
+# 热路径：行情、委托、成交、定时事件的处理函数（定义在AlgoEngine.registerEvent中）
+# 这些函数瓶颈在于事件分发（字典查询、属性访问、对象创建），而非数值计算，
+# 因此其中（以及其调用的引擎方法中）禁止出现json序列化、数据库写入、
+# 日志器创建以及每事件的对象创建
+HOT_PATH = ('processTickEvent', 'processOrderEvent', 'processTradeEvent', 'processTimerEvent')
+
+# 热路径中禁止调用的函数名
+HOT_PATH_FORBIDDEN = ('json', 'dbUpdate', 'setup_logger', 'VtLogData')
+
 ########################################################################
 class AlgoEngine(object):
     """算法交易引擎"""
 
+    # 固定实例属性，热路径上的属性访问无需查询实例字典，新增属性时需同步添加
+    __slots__ = ('mainEngine', 'eventEngine', 'rpcServer', 'use_mongodb',
+                 'algoDict', 'orderAlgoDict', 'symbolAlgoDict', 'settingDict', 'historyDict',
+                 'historyPending', 'historyLock', 'historyActive', 'historyThread', 'ioExecutor',
+                 'eventHandlers', 'algoTuple', 'orderReqLocal',
+                 'logActive', 'logTraceback', 'logDir', 'logger', 'strategy_loggers', 'failedLoggers')
+
     # 策略配置文件
     settingFileName = 'Algo_setting.json'
     settingfilePath = getJsonPath(settingFileName, __file__)
@@ -51,73 +82,129 @@ class AlgoEngine(object):
         self.use_mongodb = use_mongodb
 
         self.algoDict = {}          # algoName:algo
-        self.orderAlgoDict = {}     # vtOrderID:algo
-        self.symbolAlgoDict = {}    # vtSymbol:algo set
+        # vtOrderID:algo
+        # vtOrderID格式为"接口名.委托号"（如CTP.12），不能转换为整数作为键；
+        # 每个委托事件只查询一次，转换整数的开销反而大于字符串哈希
+        self.orderAlgoDict = {}
+        self.symbolAlgoDict = {}    # vtSymbol:algo tuple
         self.settingDict = {}       # settingName:setting
-        self.historyDict = {}       # algoName:dict
+        self.historyDict = {}       # algoName:dict，仅在历史写入线程中访问
+
+        # 算法历史写入线程，合并同一算法的更新后批量写入数据库，避免阻塞事件线程
+        # 待写入的更新在推送时即按算法合并（只保留最新），数据库阻塞时也不会堆积
+        self.historyPending = {}    # (algoName, 'var'|'param'):dict
+        self.historyLock = Lock()
+        self.historyActive = False
+        self.historyThread = None
+
+        # 配置文件写入线程
+        self.ioExecutor = ThreadPoolExecutor(max_workers=1)
+
+        self.eventHandlers = []     # 已注册的(事件类型, 处理函数)
+        self.algoTuple = ()         # algoDict中算法的快照，定时事件中遍历
+        self.orderReqLocal = local()  # 线程本地数据，缓存可复用的委托请求
         
         self.registerEvent()
 
+        self.logActive = True       # 是否推送日志事件，可在运行时关闭
+        self.logTraceback = False   # 错误日志是否附带完整堆栈，可在运行时打开
+        self.logDir = self.getLogDir()
         self.logger = None
         self.strategy_loggers = {}
+        self.failedLoggers = set()  # 创建失败的策略日志名
         self.createLogger()
 
+        if self.use_mongodb:
+            self.historyActive = True
+            self.historyThread = Thread(target=self.runHistory)
+            self.historyThread.daemon = True
+            self.historyThread.start()
+            
+            # 主引擎退出时不会调用stop，因此在进程退出时写入剩余的历史
+            atexit.register(self.stopHistory)
+
     #----------------------------------------------------------------------
     def registerEvent(self):
-        """注册事件监听"""
-        self.eventEngine.register(EVENT_TICK, self.processTickEvent)
-        self.eventEngine.register(EVENT_TIMER, self.processTimerEvent)
-        self.eventEngine.register(EVENT_ORDER, self.processOrderEvent)
-        self.eventEngine.register(EVENT_TRADE, self.processTradeEvent)
+        """
+        注册事件监听
+        处理函数为闭包，字典查询方法预先绑定为局部变量，减少每次事件的属性查找。
+        字典只会原地修改、不会被重新赋值，因此绑定的方法始终有效
+        """
+        symGet = self.symbolAlgoDict.get
+        orderGet = self.orderAlgoDict.get
+        
+        #----------------------------------------------------------------------
+        # 以下为热路径（HOT_PATH），修改时注意不要引入额外的查询和对象创建
+        #----------------------------------------------------------------------
+        def processTickEvent(event):
+            """行情事件"""
+            tick = event.dict_['data']
+            
+            algos = symGet(tick.vtSymbol)
+            if algos:
+                for algo in algos:
+                    algo.updateTick(tick)
+        
+        #----------------------------------------------------------------------
+        def processOrderEvent(event):
+            """委托事件"""
+            order = event.dict_['data']
+            
+            algo = orderGet(order.vtOrderID)
+            if algo:
+                algo.updateOrder(order)
+        
+        #----------------------------------------------------------------------
+        def processTradeEvent(event):
+            """成交事件"""
+            trade = event.dict_['data']
+            
+            algo = orderGet(trade.vtOrderID)
+            if algo:
+                algo.updateTrade(trade)
+        
+        #----------------------------------------------------------------------
+        def processTimerEvent(event):
+            """定时事件"""
+            # algoTuple会被重新赋值，因此每次通过self读取
+            for algo in self.algoTuple:
+                algo.updateTimer()
+        
+        # 保存处理函数，用于注销
+        self.eventHandlers = [(EVENT_TICK, processTickEvent),
+                              (EVENT_TIMER, processTimerEvent),
+                              (EVENT_ORDER, processOrderEvent),
+                              (EVENT_TRADE, processTradeEvent)]
+        
+        for type_, handler in self.eventHandlers:
+            self.eventEngine.register(type_, handler)
+    
+    #----------------------------------------------------------------------
+    def unregisterEvent(self):
+        """注销事件监听"""
+        for type_, handler in self.eventHandlers:
+            self.eventEngine.unregister(type_, handler)
+        
+        self.eventHandlers = []
     
     #----------------------------------------------------------------------
     def stop(self):
         """停止"""
         if self.rpcServer:
             self.rpcServer.stop()
-    
-    #----------------------------------------------------------------------
-    def processTickEvent(self, event):
-        """行情事件"""
-        tick = event.dict_['data']
-        
-        l = self.symbolAlgoDict.get(tick.vtSymbol, None)
-        if l:    
-            for algo in l:
-                algo.updateTick(tick)
-        
-    # ----------------------------------------------------------------------
-    def processOrderEvent(self, event):
-        """委托事件"""
-        order = event.dict_['data']
-        
-        algo = self.orderAlgoDict.get(order.vtOrderID, None)
-        if algo:
-            algo.updateOrder(order)
 
-    # ----------------------------------------------------------------------
-    def processTradeEvent(self, event):
-        """成交事件"""
-        trade = event.dict_['data']
-        
-        algo = self.orderAlgoDict.get(trade.vtOrderID, None)
-        if algo:
-            algo.updateTrade(trade)
-    
-    #----------------------------------------------------------------------
-    def processTimerEvent(self, event):
-        """定时事件"""
-        for algo in self.algoDict.values():
-            algo.updateTimer()
+        self.stopHistory()
+
+        self.ioExecutor.shutdown(wait=True)
     
     #----------------------------------------------------------------------
     def addAlgo(self, algoSetting):
         """新增算法"""
         templateName = algoSetting['templateName']
-        algoClass = ALGO_DICT[templateName]
-        algo = algoClass.new(self, algoSetting)
+        algo = ALGO_FACTORY_DICT[templateName](self, algoSetting)
         
         self.algoDict[algo.algoName] = algo
+        self.algoTuple = tuple(self.algoDict.values())
         
         return algo.algoName
     
@@ -125,15 +212,29 @@ class AlgoEngine(object):
     def stopAlgo(self, algoName):
         """停止算法"""
         if algoName in self.algoDict:
-            self.algoDict[algoName].stop()
+            algo = self.algoDict[algoName]
+            algo.stop()
             del self.algoDict[algoName]
+            self.algoTuple = tuple(self.algoDict.values())
+            
+            # 停止后不再推送行情
+            for vtSymbol, algos in list(self.symbolAlgoDict.items()):
+                if algo in algos:
+                    self.removeSubscribe(algo, vtSymbol)
     
     #----------------------------------------------------------------------
     def stopAll(self):
         """全部停止"""
-        l = self.algoDict.keys()
-        for algoName in l:
-            self.stopAlgo(algoName)
+        # stop中可能会回调引擎，因此先取快照再遍历，最后一次性清空
+        for algo in list(self.algoDict.values()):
+            algo.stop()
+        
+        self.algoDict.clear()
+        self.algoTuple = ()
+        
+        # 停止后不再推送行情，保留已订阅的合约
+        for vtSymbol in list(self.symbolAlgoDict.keys()):
+            self.symbolAlgoDict[vtSymbol] = ()
     
     #----------------------------------------------------------------------
     def subscribe(self, algo, vtSymbol):
@@ -143,22 +244,31 @@ class AlgoEngine(object):
             self.writeLog(u'%s订阅行情失败，找不到合约%s' %(algo.algoName, vtSymbol))
             return        
 
-        # 如果vtSymbol已存在于字典，说明已经订阅过
-        if vtSymbol in self.symbolAlgoDict:
-            s = self.symbolAlgoDict[vtSymbol]
-            s.add(algo)
+        # 行情推送时直接遍历元组，因此每次变化时重建元组，而不是原地修改
+        # 如果vtSymbol已存在于字典（包括空元组），说明已经订阅过
+        algos = self.symbolAlgoDict.get(vtSymbol, None)
+        if algos is not None:
+            if algo not in algos:
+                self.symbolAlgoDict[vtSymbol] = algos + (algo,)
             return
         # 否则需要添加到字典中并执行订阅
         else:
-            s = set()
-            self.symbolAlgoDict[vtSymbol] = s
-            s.add(algo)
+            self.symbolAlgoDict[vtSymbol] = (algo,)
             
             req = VtSubscribeReq()
             req.symbol = contract.symbol
             req.exchange = contract.exchange
             self.mainEngine.subscribe(req, contract.gatewayName)
 
+    #----------------------------------------------------------------------
+    def removeSubscribe(self, algo, vtSymbol):
+        """移除算法的行情推送（接口订阅保持不变）"""
+        algos = self.symbolAlgoDict.get(vtSymbol, None)
+        if not algos:
+            return
+        
+        self.symbolAlgoDict[vtSymbol] = tuple(a for a in algos if a is not algo)
+
     #----------------------------------------------------------------------
     def sendOrder(self, algo, vtSymbol, direction, price, volume, 
                   priceType=None, offset=None):
@@ -166,31 +276,36 @@ class AlgoEngine(object):
         contract = self.mainEngine.getContract(vtSymbol)
         if not contract:
             self.writeLog(u'%s委托下单失败，找不到合约：%s' %(algo.algoName, vtSymbol))
+            return ''
 
-        req = VtOrderReq()
+        req = self.getOrderReq()
         req.vtSymbol = vtSymbol
         req.symbol = contract.symbol
         req.exchange = contract.exchange
-        req.direction = direction        
-        req.offset = OFFSET_CLOSETODAY
+        req.direction = direction
         req.price = price
         req.volume = volume
-        
-        if priceType:
-            req.priceType = priceType
-        else:
-            req.priceType = PRICETYPE_LIMITPRICE
-        
-        if offset:
-            req.offset = offset
-        else:
-            req.offset = OFFSET_OPEN
+        req.priceType = priceType or PRICETYPE_LIMITPRICE   # 默认限价
+        req.offset = offset or OFFSET_OPEN                  # 默认开仓
         
         vtOrderID = self.mainEngine.sendOrder(req, contract.gatewayName)
-        self.orderAlgoDict[vtOrderID] = algo
+        if vtOrderID:
+            self.orderAlgoDict[vtOrderID] = algo
         
         return vtOrderID
 
+    #----------------------------------------------------------------------
+    def getOrderReq(self):
+        """
+        获取当前线程复用的委托请求对象
+        接口在sendOrder中同步读取请求内容、不会保留该对象，因此每个线程复用一个即可
+        """
+        req = getattr(self.orderReqLocal, 'req', None)
+        if req is None:
+            req = VtOrderReq()
+            self.orderReqLocal.req = req
+        return req
+
     #----------------------------------------------------------------------
     def buy(self, algo, vtSymbol, price, volume, priceType=None, offset=None):
         """买入"""
@@ -217,33 +332,42 @@ class AlgoEngine(object):
         req.sessionID = order.sessionID
         self.mainEngine.cancelOrder(req, order.gatewayName)
 
-    def createLogger(self, strategy_name=None):
+    def getLogDir(self):
         """
-        创建日志记录
+        获取日志目录，仅在引擎初始化时调用一次
         :return:
         """
         currentFolder = os.path.abspath(os.path.join(os.getcwd(), 'logs'))
         if os.path.isdir(currentFolder):
-            # 如果工作目录下，存在data子目录，就使用data子目录
-            path = currentFolder
+            # 如果工作目录下，存在logs子目录，就使用logs子目录
+            return currentFolder
         else:
-            # 否则，使用缺省保存目录 vnpy/trader/app/ctaStrategy/data
-            path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'logs'))
+            # 否则，使用缺省保存目录 vnpy/trader/logs
+            return os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'logs'))
 
+    def createLogger(self, strategy_name=None):
+        """
+        创建日志记录
+        :return:
+        """
         if strategy_name is None:
-            filename = os.path.abspath(os.path.join(path, 'AlgoEngine'))
+            filename = os.path.join(self.logDir, 'AlgoEngine')
 
             print(u'create logger:{}'.format(filename))
             self.logger = setup_logger(filename=filename, name='AlgoEngine', debug=True)
         else:
-            filename = os.path.abspath(os.path.join(path, str(strategy_name)))
+            filename = os.path.join(self.logDir, str(strategy_name))
             print(u'create logger:{}'.format(filename))
             self.strategy_loggers[strategy_name] = setup_logger(filename=filename, name=str(strategy_name), debug=True)
 
 
     # ----------------------------------------------------------------------
-    def writeLog(self, content, algo=None):
-        """输出日志"""
+    def putLogEvent(self, content, algo=None):
+        """推送日志事件"""
+        # 日志事件关闭或无人监听时，不创建任何对象直接返回
+        if not self.logActive or not self.eventEngine.hasListeners(EVENT_ALGO_LOG):
+            return
+        
         log = VtLogData()
         log.logContent = content
         
@@ -254,6 +378,11 @@ class AlgoEngine(object):
         event.dict_['data'] = log
         self.eventEngine.put(event)
 
+    # ----------------------------------------------------------------------
+    def writeLog(self, content, algo=None):
+        """输出日志"""
+        self.putLogEvent(content, algo)
+
     def writeError(self,content,algo=None):
         """
         输出错误日志
@@ -261,85 +390,114 @@ class AlgoEngine(object):
         :param algo:
         :return:
         """
-        log = VtLogData()
-        log.logContent = content
-
-        if algo:
-            log.gatewayName = algo.algoName
-
-        event = Event(EVENT_ALGO_LOG)
-        event.dict_['data'] = log
-        self.eventEngine.put(event)
+        self.putLogEvent(content, algo)
 
         if algo is not None:
-            if algo.algoName in self.strategy_loggers:
-                self.strategy_loggers[algo.algoName].error(content)
-            else:
-                self.createLogger(strategy_name=algo.algoName)
+            algoName = algo.algoName
+            logger = self.strategy_loggers.get(algoName, None)
+            
+            # 创建失败过的日志不再重复创建
+            if logger is None and algoName not in self.failedLoggers:
                 try:
-                    self.strategy_loggers[algo.algoName].error(content)
+                    self.createLogger(strategy_name=algoName)
+                    logger = self.strategy_loggers.get(algoName, None)
                 except Exception as ex:
-                    pass
+                    print(u'create logger {} failed:{}'.format(algoName, str(ex)))
+                    self.failedLoggers.add(algoName)
+            
+            if logger:
+                logger.error(content)
 
         self.mainEngine.writeError(content)
 
+    #----------------------------------------------------------------------
+    def formatException(self, content):
+        """异常日志内容，仅在logTraceback打开时附加完整堆栈"""
+        if self.logTraceback:
+            return u'{},{}'.format(content, traceback.format_exc())
+        return content
+
     #----------------------------------------------------------------------
     def putVarEvent(self, algo, d):
         """更新变量"""
+        self._putHistoryEvent(algo, d, EVENT_ALGO_VAR, 'var')
+
+    #----------------------------------------------------------------------
+    def putParamEvent(self, algo, d):
+        """更新参数"""
+        self._putHistoryEvent(algo, d, EVENT_ALGO_PARAM, 'param')
+
+    #----------------------------------------------------------------------
+    def _putHistoryEvent(self, algo, d, eventType, historyKey):
+        """推送算法变量/参数事件，并保存到历史"""
+        rpcServer = self.rpcServer
+        useMongodb = self.use_mongodb
+        
+        # 既无监听、也无RPC和数据库时，直接返回
+        if (not rpcServer and not useMongodb and
+                not self.eventEngine.hasListeners(eventType)):
+            return
+        
         algoName = algo.algoName
         
         d['algoName'] = algoName
-        event = Event(EVENT_ALGO_VAR)
+        event = Event(eventType)
         event.dict_['data'] = d
         self.eventEngine.put(event)
         
         # RPC推送
-        if self.rpcServer:
-            self.rpcServer.publish('AlgoTrading', event)
+        if rpcServer:
+            rpcServer.publish('AlgoTrading', event)
 
         # 若不使用mongodb，返回
-        if not self.use_mongodb:
+        if not useMongodb:
             return
 
-        # 保存数据到数据库
-        history = self.historyDict.setdefault(algoName, {})
-        history['algoName'] = algoName
-        history['var'] = d
+        # 交由历史写入线程保存到数据库，同一算法未写入的旧数据直接覆盖
+        with self.historyLock:
+            self.historyPending[(algoName, historyKey)] = d
+    
+    #----------------------------------------------------------------------
+    def stopHistory(self):
+        """停止历史写入线程，并写入剩余的历史"""
+        if not self.historyActive:
+            return
         
-        self.mainEngine.dbUpdate(ALGOTRADING_DB_NAME,
-                                 HISTORY_COLLECTION_NAME,
-                                 history,
-                                 {'algoName': algoName},
-                                 True)
+        self.historyActive = False
+        self.historyThread.join()
+        self.flushHistory()
 
     #----------------------------------------------------------------------
-    def putParamEvent(self, algo, d):
-        """更新参数"""
-        algoName = algo.algoName
+    def runHistory(self):
+        """历史写入线程，定时批量写入数据库"""
+        while self.historyActive:
+            sleep(HISTORY_FLUSH_INTERVAL)
+            self.flushHistory()
+
+    #----------------------------------------------------------------------
+    def flushHistory(self):
+        """取出全部待写入的更新，每个算法只写入一次最新数据"""
+        with self.historyLock:
+            pending = self.historyPending
+            self.historyPending = {}
         
-        d['algoName'] = algoName
-        event = Event(EVENT_ALGO_PARAM)
-        event.dict_['data'] = d
-        self.eventEngine.put(event)    
+        updated = set()
         
-        # RPC推送
-        if self.rpcServer:
-            self.rpcServer.publish('AlgoTrading', event)
-
-        # 若不使用mongodb，返回
-        if not self.use_mongodb:
-            return
-
-        # 保存数据到数据库
-        history = self.historyDict.setdefault(algoName, {})
-        history['algoName'] = algoName
-        history['param'] = d
+        for (algoName, key), d in pending.items():
+            history = self.historyDict.setdefault(algoName, {})
+            history['algoName'] = algoName
+            history[key] = d
+            updated.add(algoName)
         
-        self.mainEngine.dbUpdate(ALGOTRADING_DB_NAME,
-                                 HISTORY_COLLECTION_NAME,
-                                 history,
-                                 {'algoName': algoName},
-                                 True)        
+        for algoName in updated:
+            try:
+                self.mainEngine.dbUpdate(ALGOTRADING_DB_NAME,
+                                         HISTORY_COLLECTION_NAME,
+                                         self.historyDict[algoName],
+                                         {'algoName': algoName},
+                                         True)
+            except Exception as ex:
+                self.writeError(u'保存算法历史异常:{}'.format(str(ex)))
     
     #----------------------------------------------------------------------
     def getTick(self, algo, vtSymbol):
@@ -364,14 +522,39 @@ class AlgoEngine(object):
     # ----------------------------------------------------------------------
     # 策略配置相关
     def saveAlgoSettingToFile(self):
-        """保存策略配置"""
+        """保存策略配置（在配置文件写入线程中执行）"""
+        l = [dict(algoSetting) for algoSetting in self.settingDict.values()]
+        try:
+            self.ioExecutor.submit(self.writeAlgoSettingFile, l)
+            return
+        except RuntimeError:
+            pass
+        
+        # 引擎已停止、写入线程已关闭时，直接在当前线程写入
+        self.writeAlgoSettingFile(l)
+
+    def writeAlgoSettingFile(self, l):
+        """
+        写入策略配置文件
+        先写入临时文件，再替换原文件，避免写入中断导致配置文件损坏
+        :param l: 配置列表
+        :return:
+        """
+        tmpPath = self.settingfilePath + '.tmp'
         try:
-            with open(self.settingfilePath, 'w') as f:
-                l = list(self.settingDict.values())
-                jsonL = json.dumps(l, indent=4)
-                f.write(jsonL)
+            with open(tmpPath, 'wb') as f:
+                f.write(_dumps(l))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmpPath, self.settingfilePath)
         except Exception as ex:
-            self.writeError(u'保存算法配置异常:{},{}'.format(str(ex), traceback.format_exc()))
+            # 删除写入失败的临时文件
+            if os.path.isfile(tmpPath):
+                try:
+                    os.remove(tmpPath)
+                except OSError:
+                    pass
+            self.writeError(self.formatException(u'保存算法配置异常:{}'.format(str(ex))))
 
     def loadAlgoSettingFromFile(self):
         """
@@ -383,15 +566,21 @@ class AlgoEngine(object):
             self.writeLog(u'算法配置文件不存在')
             return
         try:
-            with open(self.settingfilePath, 'r', encoding='UTF-8') as f:
-                l = json.load(f)
-                for algoSetting in l:
-                    settingName = algoSetting['settingName']
-                    self.settingDict[settingName] = algoSetting
-                    self.putSettingEvent(settingName, algoSetting)
+            # orjson直接解析字节，无需先做文本解码
+            if orjson:
+                with open(self.settingfilePath, 'rb') as f:
+                    l = _loads(f.read())
+            else:
+                with open(self.settingfilePath, 'r', encoding='UTF-8') as f:
+                    l = _loads(f.read())
+            
+            for algoSetting in l:
+                settingName = algoSetting['settingName']
+                self.settingDict[settingName] = algoSetting
+                self.putSettingEvent(settingName, algoSetting)
 
         except Exception as ex:
-            self.writeError(u'加载算法配置异常:{},{}'.format(str(ex), traceback.format_exc()))
+            self.writeError(self.formatException(u'加载算法配置异常:{}'.format(str(ex))))
 
         self.writeLog(u'加载算法配置成功')
 
@@ -478,3 +667,63 @@ class AlgoRpcServer(RpcServer):
         self.register(self.engine.addAlgo)
         self.register(self.engine.stopAlgo)
         self.register(self.engine.stopAll)
+
+
+#----------------------------------------------------------------------
+def checkHotPath():
+    """
+    检查热路径中是否调用了禁止的函数
+    从HOT_PATH中的函数出发，沿self.xxx()调用递归检查AlgoEngine的方法
+    :return: 违规列表[(方法名, 调用名)]
+    """
+    with open(__file__, 'r', encoding='UTF-8') as f:
+        tree = ast.parse(f.read())
+
+    # 获取AlgoEngine的全部方法（包括registerEvent中定义的事件处理函数）
+    methodDict = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == 'AlgoEngine':
+            for item in ast.walk(node):
+                if isinstance(item, ast.FunctionDef):
+                    methodDict[item.name] = item
+
+    violations = []
+    checked = set()
+    pending = list(HOT_PATH)
+
+    while pending:
+        name = pending.pop()
+        if name in checked or name not in methodDict:
+            continue
+        checked.add(name)
+
+        for node in ast.walk(methodDict[name]):
+            if not isinstance(node, ast.Call):
+                continue
+
+            func = node.func
+            if isinstance(func, ast.Name):
+                callName = func.id
+            elif isinstance(func, ast.Attribute):
+                callName = func.attr
+                # json.xxx()
+                if isinstance(func.value, ast.Name) and func.value.id in HOT_PATH_FORBIDDEN:
+                    violations.append((name, '%s.%s' %(func.value.id, callName)))
+                    continue
+                # self.xxx()，继续检查被调用的引擎方法
+                if isinstance(func.value, ast.Name) and func.value.id == 'self':
+                    pending.append(callName)
+            else:
+                continue
+
+            if callName in HOT_PATH_FORBIDDEN:
+                violations.append((name, callName))
+
+    return violations
+
+
+if __name__ == '__main__':
+    l = checkHotPath()
+    for methodName, callName in l:
+        print(u'热路径%s中调用了%s' %(methodName, callName))
+    print(u'热路径检查完毕，发现%s处问题' %len(l))
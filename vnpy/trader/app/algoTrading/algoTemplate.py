@@ -12,9 +12,15 @@ STATUS_ACTIVE = [STATUS_NOTTRADED, STATUS_PARTTRADED, STATUS_UNKNOWN]
 
 ########################################################################
 class AlgoTemplate(object):
-    """算法模板"""
+    """
+    算法模板
+    模板的实例属性使用__slots__声明，算法子类建议同样声明__slots__
+    （列出子类新增的全部实例属性），以去掉实例字典、加快行情回调中的属性访问
+    """
     templateName = 'AlgoTemplate'
     
+    __slots__ = ('engine', 'active', 'algoName', 'activeOrderDict')
+    
     timestamp = ''
     count = 0
     